@@ -13,11 +13,20 @@ import requests
 import os
 import smtplib
 import threading
+import tempfile
+import json
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
+from urllib.request import pathname2url
 from config import Config
 
+try:
+    import fcntl
+except ImportError:   # Windows - no cross-process lock, fine for the single-process dev server
+    fcntl = None
+
 app = Flask(__name__)
 app.config.from_object(Config)
 
@@ -171,8 +180,110 @@ def seed_data():
     conn.commit()
     conn.close()
 
+# Content snapshot - public routes read an immutable copy of the content tables,
+# so they never take a lock or wait behind admin saves and /contact inserts
+SNAPSHOT_FOLDER = app.config['SNAPSHOT_FOLDER']
+SNAPSHOT_POINTER = os.path.join(SNAPSHOT_FOLDER, 'CURRENT')
+CONTENT_TABLES = ('skills', 'services', 'projects', 'experience', 'certifications', 'settings')
+_snapshot_lock = threading.Lock()   # Threads of one process (fcntl only locks between processes)
+_snapshot_current = (None, None)   # (pointer file identity, snapshot path)
+_snapshot_error = None   # Last publish failure in this process, cleared by the next successful publish
+
+def _snapshot_number(filename):
+    """Sequence number of a content-<n>.db snapshot file, None for anything else"""
+    if filename.startswith('content-') and filename.endswith('.db'):
+        number = filename[len('content-'):-len('.db')]
+        if number.isdigit():
+            return int(number)
+    return None
+
+def publish_snapshot():
+    """Copy the content tables into a new read-only snapshot and atomically point readers at it"""
+    os.makedirs(SNAPSHOT_FOLDER, exist_ok=True)
+    with _snapshot_lock, open(os.path.join(SNAPSHOT_FOLDER, 'publish.lock'), 'w') as lock_file:
+        # Serialize publishes across gunicorn workers so the newest save always wins
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        
+        # Numbered under the lock rather than by clock time, so a newer snapshot always sorts last
+        numbers = [n for n in map(_snapshot_number, os.listdir(SNAPSHOT_FOLDER)) if n is not None]
+        name = f"content-{max(numbers, default=0) + 1}.db"
+        path = os.path.join(SNAPSHOT_FOLDER, name)
+        tmp_path = path + '.tmp'
+        if os.path.exists(tmp_path):   # Left over from a publish that crashed
+            os.remove(tmp_path)
+        
+        # Only the content tables are copied - contact messages never leave database.db
+        conn = sqlite3.connect(tmp_path, isolation_level=None)
+        try:
+            conn.execute("ATTACH DATABASE 'database.db' AS src")
+            conn.execute("BEGIN")   # One read transaction, so all tables come from the same save
+            for table in CONTENT_TABLES:
+                c = conn.execute("SELECT sql FROM src.sqlite_master WHERE type = 'table' AND name = ?", (table,))
+                conn.execute(c.fetchone()[0])
+                conn.execute(f"INSERT INTO main.{table} SELECT * FROM src.{table}")
+            conn.execute("COMMIT")
+            conn.execute("DETACH DATABASE src")
+        finally:
+            conn.close()
+        os.replace(tmp_path, path)
+        
+        # Readers see either the old or the new pointer, never a partial one
+        pointer_tmp = SNAPSHOT_POINTER + '.tmp'
+        with open(pointer_tmp, 'w') as f:
+            f.write(name)
+        os.replace(pointer_tmp, SNAPSHOT_POINTER)
+        
+        # Connections already open on old snapshots keep working after unlink (POSIX);
+        # on Windows an open snapshot can't be removed yet and is retried on the next publish
+        # The new snapshot is not in `numbers`, so it can never be pruned here
+        keep_old = app.config['SNAPSHOT_KEEP'] - 1
+        for number in sorted(numbers)[:max(len(numbers) - keep_old, 0)]:
+            try:
+                os.remove(os.path.join(SNAPSHOT_FOLDER, f"content-{number}.db"))
+            except OSError:
+                pass
+
+def get_snapshot_db():
+    """Read-only, memory-mapped connection to the published snapshot (falls back to the primary)"""
+    global _snapshot_current
+    try:
+        st = os.stat(SNAPSHOT_POINTER)
+    except FileNotFoundError:
+        return get_db()
+    
+    # os.replace gives the pointer a new inode, so only re-read it after a publish
+    identity = (st.st_ino, st.st_mtime_ns)
+    cached_identity, path = _snapshot_current
+    if identity != cached_identity:
+        with open(SNAPSHOT_POINTER) as f:
+            path = os.path.join(SNAPSHOT_FOLDER, f.read().strip())
+        _snapshot_current = (identity, path)
+    
+    try:
+        conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(path))}?mode=ro&immutable=1", uri=True)
+        conn.execute(f"PRAGMA mmap_size = {int(app.config['SNAPSHOT_MMAP_SIZE'])}")
+    except sqlite3.OperationalError:
+        # Pointer target is gone (e.g. snapshots/ was cleared) - serve from the primary
+        return get_db()
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def try_publish_snapshot():
+    """Publish and record the outcome for readiness; returns False if the public snapshot is now stale"""
+    global _snapshot_error
+    try:
+        publish_snapshot()
+    except (sqlite3.Error, OSError) as e:
+        print("❌ Snapshot publish failed:", e)
+        _snapshot_error = str(e)
+        return False
+    _snapshot_error = None
+    return True
+
 init_db()
 seed_data()
+try_publish_snapshot()   # On failure the app still starts; get_snapshot_db() falls back to the primary
 
 # Authentication decorator
 def login_required(f):
@@ -184,15 +295,45 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-# Helper function - NO CACHING
+# Republish the public snapshot after an admin save
+def publishes_snapshot(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        response = f(*args, **kwargs)
+        if not try_publish_snapshot():
+            flash('Changes were saved, but the public page could not be updated.', 'error')
+        return response
+    return decorated_function
+
+# Helper function - reads the published snapshot
 def get_setting(key, default=''):
-    conn = get_db()
+    conn = get_snapshot_db()
     c = conn.cursor()
     c.execute("SELECT value FROM settings WHERE key = ?", (key,))
     result = c.fetchone()
     conn.close()
     return result[0] if result else default
 
+# Email outbox - notifications still being sent by background threads
+_outbox_lock = threading.Lock()
+_outbox_pending = 0
+
+def queue_email_notification(name, email, message):
+    """Send notification in a background thread and track it as outbox backlog"""
+    global _outbox_pending
+    with _outbox_lock:
+        _outbox_pending += 1
+
+    def worker():
+        global _outbox_pending
+        try:
+            send_email_notification(name, email, message)
+        finally:
+            with _outbox_lock:
+                _outbox_pending -= 1
+
+    threading.Thread(target=worker, daemon=True).start()
+
 # Email notification function
 
 def send_email_notification(name, email, message):
@@ -278,18 +419,156 @@ def add_no_cache(response):
         response.headers['Expires'] = '-1'
     return response
 
-# Health check for keep-alive services
+# Health checks - readiness is probed in the background and served from cache,
+# so probe traffic never touches SQLite or the filesystem in the request path
+LIVENESS_BODY = json.dumps({'status': 'ok'})
+_health_lock = threading.Lock()
+_health_probe_pid = None
+_health_status = (None, 503, json.dumps({'status': 'starting', 'checks': {}}))   # (monotonic probe time, status, body)
+STALE_BODY = json.dumps({'status': 'not_ready', 'error': 'health probe stalled', 'checks': {}})
+
+def probe_health():
+    """Check database, uploads folder and email outbox; returns (status_code, json_body)"""
+    checks = {}
+    
+    try:
+        # mode=rw so a missing database is reported instead of silently created
+        conn = sqlite3.connect('file:database.db?mode=rw', uri=True, timeout=2)
+        try:
+            conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        finally:
+            conn.close()
+        checks['database'] = {'ok': True}
+    except sqlite3.Error as e:
+        checks['database'] = {'ok': False, 'error': str(e)}
+    
+    try:
+        with tempfile.TemporaryFile(dir='uploads'):
+            pass
+        checks['uploads'] = {'ok': True}
+    except OSError as e:
+        checks['uploads'] = {'ok': False, 'error': str(e)}
+    
+    # Retry a failed publish here so the public page catches up without waiting for the next admin save
+    if _snapshot_error:
+        try_publish_snapshot()
+    if _snapshot_error:
+        checks['snapshot'] = {'ok': False, 'error': _snapshot_error}
+    else:
+        checks['snapshot'] = {'ok': os.path.exists(SNAPSHOT_POINTER)}
+    
+    backlog = _outbox_pending
+    checks['email_outbox'] = {'ok': backlog <= app.config['HEALTH_MAX_EMAIL_BACKLOG'], 'pending': backlog}
+    
+    ready = all(check['ok'] for check in checks.values())
+    body = json.dumps({
+        'status': 'ready' if ready else 'not_ready',
+        'checked_at': datetime.now().isoformat(),
+        'checks': checks
+    })
+    return (200 if ready else 503), body
+
+def _health_probe_loop():
+    global _health_status
+    while True:
+        try:
+            _health_status = (time.monotonic(), *probe_health())
+        except Exception as e:
+            _health_status = (time.monotonic(), 503, json.dumps({'status': 'not_ready', 'error': str(e), 'checks': {}}))
+        time.sleep(app.config['HEALTH_PROBE_INTERVAL'])
+
+def start_health_probe():
+    """Start the background probe once per worker process (threads don't survive fork)"""
+    global _health_probe_pid
+    if _health_probe_pid == os.getpid():
+        return
+    with _health_lock:
+        if _health_probe_pid != os.getpid():
+            _health_probe_pid = os.getpid()
+            threading.Thread(target=_health_probe_loop, daemon=True).start()
+
+start_health_probe()
+
+# Liveness - the process is up and serving requests (used by keep-alive services)
 @app.route('/health')
+@app.route('/health/live')
 def health_check():
-    return {'status': 'ok', 'timestamp': datetime.now().isoformat()}, 200
-
-# Main route - Always fresh data
+    return app.response_class(LIVENESS_BODY, status=200, mimetype='application/json')
+
+# Readiness - last cached probe result, refreshed every HEALTH_PROBE_INTERVAL seconds
+@app.route('/health/ready')
+def readiness_check():
+    start_health_probe()
+    checked_at, status, body = _health_status
+    # A probe stuck on a hung filesystem must not keep reporting its last "ready"
+    max_age = app.config['HEALTH_PROBE_INTERVAL'] * app.config['HEALTH_STALE_AFTER']
+    if checked_at is not None and time.monotonic() - checked_at > max_age:
+        status, body = 503, STALE_BODY
+    return app.response_class(body, status=status, mimetype='application/json')
+
+# Soak profiling - per-worker resource stats for soak.py, only enabled with SOAK_PROFILE=1
+if os.environ.get('SOAK_PROFILE'):
+    import tracemalloc
+    tracemalloc.start(10)
+    _soak_baseline = None
+
+    def read_proc_status():
+        """Current RSS (KB) and OS thread count from /proc, None where unavailable (non-Linux)"""
+        rss_kb, os_threads = None, None
+        try:
+            with open('/proc/self/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        rss_kb = int(line.split()[1])
+                    elif line.startswith('Threads:'):
+                        os_threads = int(line.split()[1])
+        except OSError:
+            pass
+        return rss_kb, os_threads
+
+    def count_open_fds():
+        for fd_dir in ('/proc/self/fd', '/dev/fd'):
+            if os.path.isdir(fd_dir):
+                return len(os.listdir(fd_dir))
+        return None
+
+    @app.route('/_soak/stats')
+    def soak_stats():
+        global _soak_baseline
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+        # Top allocators are reported as growth since this worker's first stats request
+        if _soak_baseline is None:
+            _soak_baseline = snapshot
+        top = [{
+            'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            'size_kb': round(stat.size / 1024, 1),
+            'size_diff_kb': round(stat.size_diff / 1024, 1),
+            'count_diff': stat.count_diff
+        } for stat in snapshot.compare_to(_soak_baseline, 'lineno')[:request.args.get('top', 10, type=int)]]
+        
+        rss_kb, os_threads = read_proc_status()
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        return {
+            'pid': os.getpid(),
+            'rss_kb': rss_kb,
+            'os_threads': os_threads,
+            'py_threads': threading.active_count(),
+            'open_fds': count_open_fds(),
+            'traced_kb': round(traced / 1024, 1),
+            'traced_peak_kb': round(traced_peak / 1024, 1),
+            'top_allocators': top
+        }
+
+# Main route - reads the snapshot published by the last admin save
 @app.route('/')
 def index():
-    conn = get_db()
+    conn = get_snapshot_db()
     c = conn.cursor()
     
-    # Fetch fresh data from database
+    # Fetch content from the snapshot
     c.execute("SELECT * FROM skills ORDER BY category, order_num")
     skills = c.fetchall()
     
@@ -305,6 +584,10 @@ def index():
     c.execute("SELECT * FROM certifications ORDER BY order_num")
     certifications = c.fetchall()
     
+    # Settings from the same connection, so the profile matches the lists above
+    c.execute("SELECT key, value FROM settings")
+    settings = {row['key']: row['value'] for row in c.fetchall()}
+    
     conn.close()
     
     # Group skills by category
@@ -315,17 +598,15 @@ def index():
             skills_by_category[category] = []
         skills_by_category[category].append(skill['name'])
     
-    # Get profile settings - fresh every time
+    # Get profile settings
     profile = {
-        'name': get_setting('profile_name'),
-        'title': get_setting('profile_title'),
-        'location': get_setting('profile_location'),
-        'email': get_setting('profile_email'),
-        'linkedin': get_setting('profile_linkedin'),
-        'summary': get_setting('profile_summary'),
-        'image': get_setting('profile_image').replace("\\", "/")
-
-
+        'name': settings.get('profile_name', ''),
+        'title': settings.get('profile_title', ''),
+        'location': settings.get('profile_location', ''),
+        'email': settings.get('profile_email', ''),
+        'linkedin': settings.get('profile_linkedin', ''),
+        'summary': settings.get('profile_summary', ''),
+        'image': settings.get('profile_image', '').replace("\\", "/")
     }
     
     return render_template('index.html',
@@ -358,11 +639,7 @@ def contact():
     conn.close()
     
     # Send email notification (non-blocking - won't fail if email not configured)
-    threading.Thread(
-    target=send_email_notification,
-    args=(name, email, message),
-    daemon=True
-    ).start()
+    queue_email_notification(name, email, message)
 
     
     flash('Thank you for your message! I will get back to you soon.', 'success')
@@ -438,6 +715,7 @@ def admin_dashboard():
 # Skills CRUD
 @app.route('/admin/skills/add', methods=['POST'])
 @login_required
+@publishes_snapshot
 def add_skill():
     category = request.form.get('category')
     name = request.form.get('name')
@@ -453,6 +731,7 @@ def add_skill():
 
 @app.route('/admin/skills/edit/<int:skill_id>', methods=['POST'])
 @login_required
+@publishes_snapshot
 def edit_skill(skill_id):
     category = request.form.get('category')
     name = request.form.get('name')
@@ -468,6 +747,7 @@ def edit_skill(skill_id):
 
 @app.route('/admin/skills/delete/<int:skill_id>')
 @login_required
+@publishes_snapshot
 def delete_skill(skill_id):
     conn = get_db()
     c = conn.cursor()
@@ -481,6 +761,7 @@ def delete_skill(skill_id):
 # Services CRUD
 @app.route('/admin/services/add', methods=['POST'])
 @login_required
+@publishes_snapshot
 def add_service():
     title = request.form.get('title')
     description = request.form.get('description')
@@ -497,6 +778,7 @@ def add_service():
 
 @app.route('/admin/services/edit/<int:service_id>', methods=['POST'])
 @login_required
+@publishes_snapshot
 def edit_service(service_id):
     title = request.form.get('title')
     description = request.form.get('description')
@@ -514,6 +796,7 @@ def edit_service(service_id):
 
 @app.route('/admin/services/delete/<int:service_id>')
 @login_required
+@publishes_snapshot
 def delete_service(service_id):
     conn = get_db()
     c = conn.cursor()
@@ -527,6 +810,7 @@ def delete_service(service_id):
 # Projects CRUD
 @app.route('/admin/projects/add', methods=['POST'])
 @login_required
+@publishes_snapshot
 def add_project():
     title = request.form.get('title')
     description = request.form.get('description')
@@ -557,6 +841,7 @@ def add_project():
 
 @app.route('/admin/projects/edit/<int:project_id>', methods=['POST'])
 @login_required
+@publishes_snapshot
 def edit_project(project_id):
     title = request.form.get('title')
     description = request.form.get('description')
@@ -587,6 +872,7 @@ def edit_project(project_id):
 
 @app.route('/admin/projects/delete/<int:project_id>')
 @login_required
+@publishes_snapshot
 def delete_project(project_id):
     conn = get_db()
     c = conn.cursor()
@@ -600,6 +886,7 @@ def delete_project(project_id):
 # Certifications CRUD
 @app.route('/admin/certifications/add', methods=['POST'])
 @login_required
+@publishes_snapshot
 def add_certification():
     title = request.form.get('title')
     issuer = request.form.get('issuer')
@@ -617,6 +904,7 @@ def add_certification():
 
 @app.route('/admin/certifications/edit/<int:cert_id>', methods=['POST'])
 @login_required
+@publishes_snapshot
 def edit_certification(cert_id):
     title = request.form.get('title')
     issuer = request.form.get('issuer')
@@ -634,6 +922,7 @@ def edit_certification(cert_id):
 
 @app.route('/admin/certifications/delete/<int:cert_id>')
 @login_required
+@publishes_snapshot
 def delete_certification(cert_id):
     conn = get_db()
     c = conn.cursor()
@@ -647,6 +936,7 @@ def delete_certification(cert_id):
 # Settings update
 @app.route('/admin/settings/update', methods=['POST'])
 @login_required
+@publishes_snapshot
 def update_settings():
     conn = get_db()
     c = conn.cursor()
@@ -27,5 +27,15 @@ class Config:
     # Database
     DATABASE = 'database.db'
     
+    # Content snapshot - public pages read an immutable copy published on every admin save
+    SNAPSHOT_FOLDER = 'snapshots'
+    SNAPSHOT_KEEP = 3   # Older snapshots are deleted after each publish
+    SNAPSHOT_MMAP_SIZE = 64 * 1024 * 1024
+    
+    # Health checks (readiness is served from a cached status refreshed in the background)
+    HEALTH_PROBE_INTERVAL = max(1, int(os.environ.get('HEALTH_PROBE_INTERVAL', 5)))   # Seconds between probes
+    HEALTH_STALE_AFTER = 3   # Probe intervals without a fresh result before readiness fails
+    HEALTH_MAX_EMAIL_BACKLOG = int(os.environ.get('HEALTH_MAX_EMAIL_BACKLOG', 20))   # Most pending notifications still reported as ready
+    
     # Flask settings
     TEMPLATES_AUTO_RELOAD = True
\ No newline at end of file
@@ -0,0 +1,348 @@
+"""
+Soak test harness - runs a mixed workload against a local server for hours
+while sampling RSS, threads, open file descriptors and tracemalloc top
+allocators per gunicorn worker, then reports anything that keeps growing.
+
+Usage:
+    python soak.py --duration 4h --workers 2
+    python soak.py --url http://127.0.0.1:5000 --duration 30m   # Existing server started with SOAK_PROFILE=1
+
+When no --url is given the harness starts its own gunicorn server in a
+temporary directory, so the real database.db and uploads/ are never touched.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import requests
+
+ADMIN_USERNAME = 'soak-admin'
+ADMIN_PASSWORD = 'soak-password'
+
+
+def parse_duration(value):
+    """Parse '90', '90s', '30m' or '4h' into seconds"""
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    if value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+# =======================
+# SERVER
+# =======================
+def start_server(args):
+    """Start gunicorn with SOAK_PROFILE=1 in a scratch copy of the app's data directories"""
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    workdir = tempfile.mkdtemp(prefix='portfolio-soak-')
+    shutil.copytree(os.path.join(app_dir, 'uploads'), os.path.join(workdir, 'uploads'))
+
+    env = dict(os.environ)
+    # Never send real notifications during a soak run
+    for key in ('EMAIL_USER', 'EMAIL_PASSWORD', 'SENDGRID_API_KEY', 'RENDER'):
+        env.pop(key, None)
+    env.update({
+        'SOAK_PROFILE': '1',
+        'ADMIN_USERNAME': ADMIN_USERNAME,
+        'ADMIN_PASSWORD': ADMIN_PASSWORD,
+        'PYTHONPATH': app_dir + os.pathsep + env.get('PYTHONPATH', ''),
+    })
+
+    cmd = [sys.executable, '-m', 'gunicorn', 'app:app',
+           '--bind', f'127.0.0.1:{args.port}',
+           '--workers', str(args.workers),
+           '--max-requests', '0']
+    server = subprocess.Popen(cmd, cwd=workdir, env=env)
+
+    url = f'http://127.0.0.1:{args.port}'
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            # Workers import the app with tracemalloc on, so the first response can be slow
+            requests.get(url + '/health', timeout=5)
+            return server, workdir, url
+        except requests.RequestException:
+            if server.poll() is not None:
+                shutil.rmtree(workdir, ignore_errors=True)
+                sys.exit(f"gunicorn exited with code {server.returncode}")
+            time.sleep(0.2)
+    stop_server(server, workdir)
+    sys.exit("gunicorn did not start serving within 60 seconds")
+
+
+def stop_server(server, workdir):
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+# =======================
+# WORKLOAD
+# =======================
+class Workload:
+    """Mixed public/admin traffic; each client thread keeps its own session"""
+
+    def __init__(self, url, upload_mb, admin, timeout):
+        self.url = url
+        self.timeout = timeout   # A hung server shows up as errors instead of blocking the run
+        self.upload = os.urandom(int(upload_mb * 1024 * 1024)) if admin else None
+        self.admin = admin
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.counts = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.latency = defaultdict(float)
+
+        self.actions = [
+            (50, 'GET /', lambda s: self.get(s, '/')),
+            (10, 'GET /health', lambda s: self.get(s, '/health')),
+            (10, 'GET /health/ready', lambda s: self.get(s, '/health/ready')),
+            (5, 'GET /download-resume', lambda s: self.get(s, '/download-resume')),
+            (5, 'GET /uploads/profile.jpeg', lambda s: self.get(s, '/uploads/profile.jpeg')),
+            (10, 'POST /contact', self.contact),
+        ]
+        # Admin writes and uploads only run against a server the harness owns
+        if admin:
+            self.actions += [
+                (5, 'GET /admin', self.dashboard),
+                (5, 'POST /admin/settings/update', self.upload_resume),
+            ]
+        self.weights = [weight for weight, _, _ in self.actions]
+
+    def get(self, session, path):
+        return session.get(self.url + path, timeout=self.timeout)
+
+    def login(self, session):
+        session.post(self.url + '/admin/login',
+                     data={'username': ADMIN_USERNAME, 'password': ADMIN_PASSWORD},
+                     allow_redirects=False, timeout=self.timeout)
+
+    def contact(self, session):
+        return session.post(self.url + '/contact', allow_redirects=False, timeout=self.timeout, data={
+            'name': 'Soak Test',
+            'email': 'soak@example.com',
+            'message': 'soak ' + str(random.random())
+        })
+
+    def dashboard(self, session):
+        return session.get(self.url + '/admin', allow_redirects=False, timeout=self.timeout)
+
+    def upload_resume(self, session):
+        return session.post(self.url + '/admin/settings/update', allow_redirects=False, timeout=self.timeout,
+                            files={'resume': ('resume.pdf', self.upload, 'application/pdf')})
+
+    def run(self, deadline):
+        session = requests.Session()
+        if self.admin:
+            try:
+                self.login(session)
+            except requests.RequestException:
+                pass   # Retried on the first redirect to /admin/login
+        while time.time() < deadline and not self.stopped.is_set():
+            _, name, action = random.choices(self.actions, weights=self.weights)[0]
+            start = time.perf_counter()
+            try:
+                response = action(session)
+                failed = response.status_code >= 400
+                if response.status_code == 302 and '/admin/login' in response.headers.get('Location', ''):
+                    self.login(session)
+            except requests.RequestException:
+                failed = True
+            elapsed = time.perf_counter() - start
+            if self.stopped.is_set():
+                break
+            with self.lock:
+                self.counts[name] += 1
+                self.latency[name] += elapsed
+                if failed:
+                    self.errors[name] += 1
+
+
+# =======================
+# SAMPLING
+# =======================
+def sample_workers(url, workers, top):
+    """Hit /_soak/stats over fresh connections until every worker has answered (or we give up)"""
+    stats = {}
+    for _ in range(workers * 8):
+        try:
+            response = requests.get(url + '/_soak/stats', params={'top': top},
+                                    headers={'Connection': 'close'}, timeout=10)
+        except requests.RequestException:
+            continue
+        if response.status_code == 404:
+            sys.exit("/_soak/stats not found - start the server with SOAK_PROFILE=1")
+        data = response.json()
+        stats[data['pid']] = data
+        if len(stats) >= workers:
+            break
+    return list(stats.values())
+
+
+def slope_per_hour(points):
+    """Least-squares growth rate of (seconds, value) points, per hour"""
+    if len(points) < 2:
+        return 0.0
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var = sum((t - mean_t) ** 2 for t, _ in points)
+    if not var:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / var * 3600
+
+
+# =======================
+# REPORT
+# =======================
+METRICS = [
+    # (key, label, unit, threshold argument)
+    ('rss_kb', 'RSS', 'KB', 'rss_growth_kb'),
+    ('traced_kb', 'tracemalloc', 'KB', 'rss_growth_kb'),
+    ('os_threads', 'OS threads', '', 'thread_growth'),
+    ('py_threads', 'Python threads', '', 'thread_growth'),
+    ('open_fds', 'Open FDs', '', 'fd_growth'),
+]
+
+
+def build_report(samples, args):
+    """Compare each worker's first and last samples and flag metrics that kept growing"""
+    by_pid = defaultdict(list)
+    for sample in samples:
+        by_pid[sample['pid']].append(sample)
+
+    report = {'workers': {}, 'flags': []}
+    for pid, worker_samples in sorted(by_pid.items()):
+        first, last = worker_samples[0], worker_samples[-1]
+        worker = {'samples': len(worker_samples), 'metrics': {}, 'top_allocators': last['top_allocators']}
+        for key, label, unit, threshold_arg in METRICS:
+            if first.get(key) is None or last.get(key) is None:
+                continue
+            growth = last[key] - first[key]
+            points = [(s['t'], s[key]) for s in worker_samples]
+            worker['metrics'][key] = {
+                'first': first[key],
+                'last': last[key],
+                'growth': round(growth, 1),
+                'per_hour': round(slope_per_hour(points), 1),
+            }
+            if len(worker_samples) > 1 and growth > getattr(args, threshold_arg):
+                report['flags'].append(f"worker {pid}: {label} grew by {growth:.0f}{unit} "
+                                       f"({first[key]} -> {last[key]})")
+        report['workers'][pid] = worker
+    return report
+
+
+def print_report(report, workload, duration):
+    with workload.lock:
+        counts = dict(workload.counts)
+        errors = dict(workload.errors)
+        latency = dict(workload.latency)
+
+    print("\n" + "=" * 60)
+    print(f"SOAK REPORT - {duration / 60:.1f} minutes")
+    print("=" * 60)
+
+    print("\nRequests:")
+    for name in sorted(counts):
+        count = counts[name]
+        print(f"  {name:32} {count:8} req  {errors.get(name, 0):6} err  "
+              f"{latency[name] / count * 1000:8.1f} ms avg")
+
+    for pid, worker in report['workers'].items():
+        print(f"\nWorker {pid} ({worker['samples']} samples):")
+        for key, metric in worker['metrics'].items():
+            print(f"  {key:16} {metric['first']:>10} -> {metric['last']:>10}  "
+                  f"({metric['growth']:+}, {metric['per_hour']:+}/h)")
+        print("  Top allocators by growth:")
+        for stat in worker['top_allocators'][:5]:
+            print(f"    {stat['size_diff_kb']:+10.1f} KB  {stat['count_diff']:+7} blocks  {stat['location']}")
+
+    print()
+    if report['flags']:
+        print("GROWTH DETECTED:")
+        for flag in report['flags']:
+            print("  - " + flag)
+    else:
+        print("No resource growth above thresholds.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test with per-worker resource sampling")
+    parser.add_argument('--url', help="Target an existing server (started with SOAK_PROFILE=1) instead of starting one")
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn workers to start / expect")
+    parser.add_argument('--clients', type=int, default=4, help="Concurrent client threads")
+    parser.add_argument('--duration', type=parse_duration, default=parse_duration('1h'))
+    parser.add_argument('--warmup', type=parse_duration, default=parse_duration('2m'),
+                        help="Traffic before the first sample, so imports and caches settle")
+    parser.add_argument('--interval', type=parse_duration, default=parse_duration('30s'))
+    parser.add_argument('--request-timeout', type=parse_duration, default=parse_duration('30s'),
+                        help="Per-request timeout; timed-out requests count as errors")
+    parser.add_argument('--upload-mb', type=float, default=4, help="Size of admin resume uploads")
+    parser.add_argument('--top', type=int, default=10, help="tracemalloc allocators per sample")
+    parser.add_argument('--rss-growth-kb', type=float, default=20 * 1024)
+    parser.add_argument('--thread-growth', type=float, default=5)
+    parser.add_argument('--fd-growth', type=float, default=10)
+    parser.add_argument('--output', default='soak_report.json')
+    args = parser.parse_args()
+
+    server = workdir = None
+    url = args.url
+    if not url:
+        server, workdir, url = start_server(args)
+
+    start = time.time()
+    deadline = start + args.warmup + args.duration
+    workload = Workload(url, args.upload_mb, admin=server is not None, timeout=args.request_timeout)
+    clients = [threading.Thread(target=workload.run, args=(deadline,), daemon=True)
+               for _ in range(args.clients)]
+    for client in clients:
+        client.start()
+
+    samples = []
+    try:
+        time.sleep(args.warmup)
+        while time.time() < deadline:
+            now = round(time.time() - start, 1)
+            for stats in sample_workers(url, args.workers, args.top):
+                stats['t'] = now
+                samples.append(stats)
+            with workload.lock:
+                sent = sum(workload.counts.values())
+            print(f"[{now / 60:6.1f} min] sampled {len(samples)} so far, "
+                  f"{sent} requests sent", flush=True)
+            time.sleep(min(args.interval, max(0, deadline - time.time())))
+        for client in clients:
+            client.join()
+    except KeyboardInterrupt:
+        print("\nInterrupted - reporting on samples collected so far")
+    finally:
+        # Client threads may still be mid-request; stop them recording before reporting
+        workload.stopped.set()
+        if server:
+            stop_server(server, workdir)
+
+    report = build_report(samples, args)
+    print_report(report, workload, time.time() - start)
+    with open(args.output, 'w') as f:
+        json.dump({'report': report, 'samples': samples}, f, indent=2)
+    print(f"\nFull samples written to {args.output}")
+    sys.exit(1 if report['flags'] else 0)
+
+
+if __name__ == '__main__':
+    main()